@@ -28,13 +28,14 @@ import json
 import time
 import logging
 import asyncio
+import random
 import threading
 import signal
 import sys
 from typing import Dict, Any, List, Optional, AsyncGenerator, Union
 from quart import Quart, request, jsonify, Response
 from quart_cors import cors
-from salesforce_models_client import AsyncSalesforceModelsClient
+from salesforce_models_client import AsyncSalesforceModelsClient, MODEL_API_NAMES
 from connection_pool import get_connection_pool
 from tool_schemas import ToolCallingConfig
 from tool_handler import ToolCallingHandler, ToolCallingMode
@@ -65,6 +66,9 @@ _client_lock = asyncio.Lock()
 tool_calling_handler = None
 tool_calling_config = ToolCallingConfig()
 
+# Response debug logging flag, read once at import instead of on every response
+SF_RESPONSE_DEBUG = os.getenv('SF_RESPONSE_DEBUG', 'false').lower() == 'true'
+
 def async_with_token_refresh(func):
     """
     Async decorator to handle token refresh for API calls.
@@ -279,6 +283,13 @@ async def initialize_global_config():
         logger.error(f"❌ Failed to initialize async configuration: {e}")
         return False
 
+# Friendly model names -> Salesforce API model names: the shared client table plus OpenAI aliases
+SALESFORCE_MODEL_MAPPING = {
+    **MODEL_API_NAMES,
+    "gpt-4-turbo": MODEL_API_NAMES["gpt-4"],
+    "gpt-3.5-turbo": MODEL_API_NAMES["gpt-4-mini"], # Map to mini for compatibility
+}
+
 def map_model_name(model: str) -> str:
     """
     Map friendly model names to Salesforce API model names.
@@ -289,18 +300,7 @@ def map_model_name(model: str) -> str:
     Returns:
         str: Salesforce API model name
     """
-    model_mapping = {
-        "claude-3-haiku": "sfdc_ai__DefaultBedrockAnthropicClaude3Haiku",
-        "claude-3-sonnet": "sfdc_ai__DefaultBedrockAnthropicClaude37Sonnet", 
-        "claude-4-sonnet": "sfdc_ai__DefaultBedrockAnthropicClaude4Sonnet",
-        "gpt-4": "sfdc_ai__DefaultGPT4Omni",
-        "gpt-4-mini": "sfdc_ai__DefaultOpenAIGPT4OmniMini",
-        "gpt-4-turbo": "sfdc_ai__DefaultGPT4Omni",
-        "gpt-3.5-turbo": "sfdc_ai__DefaultOpenAIGPT4OmniMini", # Map to mini for compatibility
-        "gemini-pro": "sfdc_ai__DefaultVertexAIGemini25Flash001"
-    }
-    
-    return model_mapping.get(model, model)
+    return SALESFORCE_MODEL_MAPPING.get(model, model)
 
 @app.before_serving
 async def startup():
@@ -368,7 +368,8 @@ async def chat_completions():
     - Uses connection pool directly in async context
     - True async/await throughout request lifecycle
     """
-    request_start_time = time.time()
+    # Monotonic nanosecond clock for latency tracking (immune to wall-clock adjustments)
+    request_start_time = time.perf_counter_ns()
     
     try:
         # Handle GET requests for endpoint documentation
@@ -493,13 +494,13 @@ async def chat_completions():
         # CRITICAL FIX: Ensure error responses also have proper n8n headers
         return add_n8n_compatible_headers(error_response), 500
 
-async def generate_streaming_response(response: Dict[str, Any], request_start_time: float, model: str = "claude-3-haiku") -> Response:
+async def generate_streaming_response(response: Dict[str, Any], request_start_time: int, model: str = "claude-3-haiku") -> Response:
     """
     Generate async streaming response with proper OpenAI format.
     
     Args:
         response: Response data to stream
-        request_start_time: Request start timestamp for performance tracking
+        request_start_time: Request start time from time.perf_counter_ns() for performance tracking
         model: Model name for response headers
         
     Returns:
@@ -509,8 +510,10 @@ async def generate_streaming_response(response: Dict[str, Any], request_start_ti
         content = extract_content_from_response(response)
         
         # Generate a unique ID for this streaming response
-        stream_id = f"chatcmpl-{int(time.time())}{hash(str(response)) % 1000}"
         created_timestamp = int(time.time())
+        # Random suffix instead of hash(str(response)): stringifying the whole payload just to
+        # disambiguate ids cost O(response size) per request
+        stream_id = f"chatcmpl-{created_timestamp}{random.randrange(1000)}"
         
         # Check if this is a tool calling response
         has_tool_calls = False
@@ -902,8 +905,8 @@ async def format_openai_response_async(sf_response: Dict[str, Any], model: str,
     Returns:
         Dict[str, Any]: OpenAI-compatible response format
     """
-    # Enable debug mode based on environment variable
-    debug_mode = os.getenv('SF_RESPONSE_DEBUG', 'false').lower() == 'true'
+    # Enable debug mode based on environment variable (resolved at import)
+    debug_mode = SF_RESPONSE_DEBUG
     
     # Debug logging to understand response structure
     if debug_mode:
@@ -950,11 +953,12 @@ async def format_openai_response_async(sf_response: Dict[str, Any], model: str,
             if "tool_calls" in message:
                 tool_calls = message["tool_calls"]
     
-    # Create OpenAI-compatible response
+    # Create OpenAI-compatible response (one clock read so "id" and "created" agree)
+    created = int(time.time())
     openai_response = {
-        "id": f"chatcmpl-{int(time.time())}{hash(str(sf_response)) % 1000}",
+        "id": f"chatcmpl-{created}{random.randrange(1000)}",
         "object": "chat.completion",
-        "created": int(time.time()),
+        "created": created,
         "model": model,
         "choices": [
             {
@@ -1065,6 +1069,18 @@ def estimate_tokens(text: str) -> int:
         return 0
     return len(text.split()) + len(text) // 4
 
+# Static n8n-compatible header set, built once at import
+N8N_COMPATIBLE_HEADERS = {
+    'Content-Type': 'application/json; charset=utf-8',
+    'Cache-Control': 'no-cache, no-store, must-revalidate',
+    'Pragma': 'no-cache',
+    'Expires': '0',
+    'X-Content-Type-Options': 'nosniff',
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': 'Content-Type, Authorization',
+    'Access-Control-Allow-Methods': 'POST, GET, OPTIONS',
+}
+
 def add_n8n_compatible_headers(response):
     """
     Add n8n-compatible headers to ensure proper content type validation.
@@ -1075,25 +1091,19 @@ def add_n8n_compatible_headers(response):
     Returns:
         Response object with n8n-compatible headers
     """
-    response.headers['Content-Type'] = 'application/json; charset=utf-8'
-    response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
-    response.headers['Pragma'] = 'no-cache'
-    response.headers['Expires'] = '0'
-    response.headers['X-Content-Type-Options'] = 'nosniff'
-    response.headers['Access-Control-Allow-Origin'] = '*'
-    response.headers['Access-Control-Allow-Headers'] = 'Content-Type, Authorization'
-    response.headers['Access-Control-Allow-Methods'] = 'POST, GET, OPTIONS'
+    # Headers.update() replaces existing values, matching per-key assignment
+    response.headers.update(N8N_COMPATIBLE_HEADERS)
     return response
 
 
-async def track_request_performance(request_start_time: float):
+async def track_request_performance(request_start_time: int):
     """
     Track async request performance metrics.
     
     Args:
-        request_start_time: Timestamp when request started
+        request_start_time: time.perf_counter_ns() reading taken when the request started
     """
-    response_time_ms = (time.time() - request_start_time) * 1000
+    response_time_ms = (time.perf_counter_ns() - request_start_time) / 1_000_000
     
     # Update performance metrics
     metrics = async_performance_metrics
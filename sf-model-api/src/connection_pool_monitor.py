@@ -14,11 +14,14 @@ Usage:
 """
 
 import asyncio
+import gc
 import time
 import json
 import sys
 import argparse
 import aiohttp
+from collections import Counter
+from contextlib import contextmanager
 from typing import Dict, Any, List
 import statistics
 
@@ -30,6 +33,59 @@ except ImportError:
     from connection_pool import get_connection_pool, benchmark_connection_reuse
 
 
+@contextmanager
+def measure_ms(samples: List[float]):
+    """
+    Time the enclosed block with the monotonic high-resolution clock.
+    
+    Only blocks that complete without raising are recorded, so failed
+    requests never skew the latency statistics.
+    
+    Args:
+        samples: List the elapsed time (in milliseconds) is appended to
+    """
+    start_time = time.perf_counter()
+    yield
+    samples.append((time.perf_counter() - start_time) * 1000)  # Convert to ms
+
+
+@contextmanager
+def gc_paused():
+    """
+    Suspend the cyclic garbage collector for a short timing window.
+    
+    Existing objects are frozen into the permanent generation first so a collection
+    triggered right after the window doesn't rescan them. Only use around bounded loops.
+    """
+    gc.collect()
+    gc.freeze()
+    gc.disable()
+    try:
+        yield
+    finally:
+        gc.enable()
+        gc.unfreeze()
+
+
+def latency_percentiles(samples: List[float]) -> Dict[str, float]:
+    """
+    Compute p95/p99 latencies from a single quantile pass.
+    
+    Args:
+        samples: Latency samples in milliseconds
+        
+    Returns:
+        Dict[str, float]: 'p95' and 'p99' values
+    """
+    if len(samples) < 2:
+        value = samples[0] if samples else 0.0
+        return {'p95': value, 'p99': value}
+    
+    # One sort for both percentiles instead of sorting once per percentile
+    cut_points = statistics.quantiles(samples, n=100, method='inclusive')
+    return {'p95': cut_points[94], 'p99': cut_points[98]}
+
+
 class ConnectionPoolMonitor:
     """
     Monitors and validates connection pool performance for the Salesforce Models API Gateway.
@@ -51,52 +107,63 @@ class ConnectionPoolMonitor:
         """
         print(f"🏃‍♂️ Running connection pool benchmark with {iterations} iterations...")
         
+        # Warm-up (discarded): create the pooled session and pay one-time ClientSession/SSL
+        # setup costs up front so neither skews the first timed samples
+        await self.pool.get_session()
+        warmup_session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(ssl=True))
+        await warmup_session.close()
+        
         # Reset pool statistics for clean benchmark
         self.pool.reset_stats()
         
         # Test 1: Connection pool session acquisition time
-        pool_times = []
-        for i in range(iterations):
-            start_time = time.perf_counter()
-            session = await self.pool.get_session()
-            end_time = time.perf_counter()
-            pool_times.append((end_time - start_time) * 1000)  # Convert to ms
-            
-            if i % 100 == 0:
-                print(f"  Progress: {i}/{iterations} iterations completed")
+        # Acquisition takes microseconds, so time it inline with a pre-sized result list and
+        # local bindings to keep context-manager and attribute-lookup overhead out of the samples
+        pool_times = [0.0] * iterations
+        perf_counter = time.perf_counter
+        get_session = self.pool.get_session
+        with gc_paused():
+            for i in range(iterations):
+                start_time = perf_counter()
+                session = await get_session()
+                pool_times[i] = (perf_counter() - start_time) * 1000  # Convert to ms
+                
+                if i % 100 == 0:
+                    print(f"  Progress: {i}/{iterations} iterations completed")
         
         # Test 2: New session creation time (for comparison)
         new_session_times = []
-        for i in range(min(100, iterations)):  # Limit to 100 for performance
-            start_time = time.perf_counter()
-            timeout = aiohttp.ClientTimeout(total=60)
-            session = aiohttp.ClientSession(
-                timeout=timeout,
-                connector=aiohttp.TCPConnector(ssl=True)
-            )
-            await session.close()
-            end_time = time.perf_counter()
-            new_session_times.append((end_time - start_time) * 1000)  # Convert to ms
+        with gc_paused():
+            for i in range(min(100, iterations)):  # Limit to 100 for performance
+                with measure_ms(new_session_times):
+                    timeout = aiohttp.ClientTimeout(total=60)
+                    session = aiohttp.ClientSession(
+                        timeout=timeout,
+                        connector=aiohttp.TCPConnector(ssl=True)
+                    )
+                    await session.close()
         
         # Calculate statistics
+        pool_percentiles = latency_percentiles(pool_times)
+        new_session_percentiles = latency_percentiles(new_session_times)
         pool_stats = {
-            'mean': statistics.mean(pool_times),
+            'mean': statistics.fmean(pool_times),
             'median': statistics.median(pool_times),
             'stdev': statistics.stdev(pool_times) if len(pool_times) > 1 else 0,
             'min': min(pool_times),
             'max': max(pool_times),
-            'p95': sorted(pool_times)[int(0.95 * len(pool_times))],
-            'p99': sorted(pool_times)[int(0.99 * len(pool_times))]
+            'p95': pool_percentiles['p95'],
+            'p99': pool_percentiles['p99']
         }
         
         new_session_stats = {
-            'mean': statistics.mean(new_session_times),
+            'mean': statistics.fmean(new_session_times),
             'median': statistics.median(new_session_times),
             'stdev': statistics.stdev(new_session_times) if len(new_session_times) > 1 else 0,
             'min': min(new_session_times),
             'max': max(new_session_times),
-            'p95': sorted(new_session_times)[int(0.95 * len(new_session_times))],
-            'p99': sorted(new_session_times)[int(0.99 * len(new_session_times))]
+            'p95': new_session_percentiles['p95'],
+            'p99': new_session_percentiles['p99']
         }
         
         # Calculate improvement metrics
@@ -145,46 +212,51 @@ class ConnectionPoolMonitor:
         
         # Reset statistics
         self.pool.reset_stats()
-        start_time = time.time()
+        # Monotonic clock so the deadline is immune to wall-clock adjustments
+        start_time = time.perf_counter()
         end_time = start_time + duration_seconds
         
         request_times = []
         error_count = 0
+        error_types = Counter()  # Tally of failures by exception type
         completed_requests = 0
         
         async def make_request():
             nonlocal error_count, completed_requests
             try:
-                request_start = time.perf_counter()
-                session = await self.pool.get_session()
-                # Simulate a typical API request pattern
-                await asyncio.sleep(0.01)  # Simulate processing time
-                request_end = time.perf_counter()
-                request_times.append((request_end - request_start) * 1000)
+                with measure_ms(request_times):
+                    session = await self.pool.get_session()
+                    # Simulate a typical API request pattern
+                    await asyncio.sleep(0.01)  # Simulate processing time
                 completed_requests += 1
             except Exception as e:
                 error_count += 1
-                print(f"❌ Request error: {e}")
+                error_type = type(e).__name__
+                if not error_types[error_type]:
+                    # Report each failure type once instead of printing on every request
+                    print(f"❌ Request error ({error_type}): {e}")
+                error_types[error_type] += 1
+        
+        async def worker():
+            # Each worker issues its next request as soon as the previous one completes,
+            # keeping concurrency constant instead of stalling on batch barriers
+            while time.perf_counter() < end_time:
+                await make_request()
         
         # Run concurrent requests for specified duration
-        tasks = []
-        while time.time() < end_time:
-            # Launch concurrent requests
-            batch_tasks = [make_request() for _ in range(min(concurrent_requests, 10))]
-            tasks.extend(batch_tasks)
-            await asyncio.gather(*batch_tasks, return_exceptions=True)
-            await asyncio.sleep(0.1)  # Brief pause between batches
+        await asyncio.gather(*(worker() for _ in range(concurrent_requests)), return_exceptions=True)
         
         # Calculate stress test results
-        total_duration = time.time() - start_time
+        total_duration = time.perf_counter() - start_time
         requests_per_second = completed_requests / total_duration
         
         if request_times:
+            request_percentiles = latency_percentiles(request_times)
             latency_stats = {
-                'mean_ms': statistics.mean(request_times),
+                'mean_ms': statistics.fmean(request_times),
                 'median_ms': statistics.median(request_times),
-                'p95_ms': sorted(request_times)[int(0.95 * len(request_times))],
-                'p99_ms': sorted(request_times)[int(0.99 * len(request_times))],
+                'p95_ms': request_percentiles['p95'],
+                'p99_ms': request_percentiles['p99'],
                 'max_ms': max(request_times)
             }
         else:
@@ -200,6 +272,7 @@ class ConnectionPoolMonitor:
                 'completed_requests': completed_requests,
                 'error_count': error_count,
                 'error_rate_percentage': round((error_count / max(1, completed_requests + error_count)) * 100, 2),
+                'error_breakdown': dict(error_types.most_common()),
                 'requests_per_second': round(requests_per_second, 2),
                 'latency_statistics': latency_stats
             },
@@ -374,4 +447,13 @@ async def main():
 
 
 if __name__ == "__main__":
+    try:
+        # OPTIMIZED: uvloop's event loop lowers per-task scheduling overhead in the load driver,
+        # so measurements reflect the pool rather than the loop
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        # Fallback: default asyncio event loop
+        pass
+    
     sys.exit(asyncio.run(main()))
\ No newline at end of file
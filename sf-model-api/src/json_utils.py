@@ -0,0 +1,42 @@
+"""
+JSON Serialization Helpers for Salesforce Models API Gateway
+============================================================
+
+Shared optional-orjson serializers. orjson encodes several times faster than the
+standard library, but it refuses some payloads json.dumps accepts (integers wider
+than 64 bits, non-str dict keys). Those payloads fall back to the standard library
+so switching serializer never turns a previously valid payload into an error.
+"""
+
+import json
+from typing import Any
+
+try:
+    # OPTIMIZED: orjson serializes straight to UTF-8 bytes in C.
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so existing handlers still apply.
+    import orjson
+    json_loads = orjson.loads
+
+    def json_dumps(obj: Any) -> str:
+        """Serialize obj to a JSON string, using orjson when it can encode obj."""
+        try:
+            return orjson.dumps(obj).decode('utf-8')
+        except TypeError:
+            # orjson rejects integers wider than 64 bits and non-str dict keys
+            return json.dumps(obj)
+
+    def json_dumps_bytes(obj: Any) -> bytes:
+        """Serialize obj to UTF-8 JSON bytes, using orjson when it can encode obj."""
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            # orjson rejects integers wider than 64 bits and non-str dict keys
+            return json.dumps(obj).encode('utf-8')
+except ImportError:
+    # Fallback: standard library serializer
+    json_loads = json.loads
+    json_dumps = json.dumps
+
+    def json_dumps_bytes(obj: Any) -> bytes:
+        """Serialize obj to UTF-8 JSON bytes."""
+        return json.dumps(obj).encode('utf-8')
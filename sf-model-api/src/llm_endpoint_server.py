@@ -83,6 +83,9 @@ client_initialized = False
 tool_calling_handler = None
 tool_calling_config = ToolCallingConfig()
 
+# Response debug logging flag, read once at import instead of on every response
+SF_RESPONSE_DEBUG = os.getenv('SF_RESPONSE_DEBUG', 'false').lower() == 'true'
+
 # Streaming Configuration
 class StreamingConfig:
     """Enhanced configuration for streaming responses using true OpenAI architecture."""
@@ -274,10 +277,11 @@ class OpenAIStreamingGenerator:
  
     def _format_error_chunk(self, error_message: str) -> str:
         """Format error chunk for streaming."""
+        created = int(time.time())
         chunk = {
-            "id": f"chatcmpl-{int(time.time())}",
+            "id": f"chatcmpl-{created}",
             "object": "chat.completion.chunk",
-            "created": int(time.time()),
+            "created": created,
             "model": "claude-3-haiku",
             "choices": [{
                 "index": 0,
@@ -1084,6 +1088,28 @@ def ensure_valid_token():
         logger.error(f"❌ Token validation failed: {e}")
         return False
 
+# Model name table for map_model_name, built once at import
+OPENAI_MODEL_MAPPING = {
+    # OpenAI model names -> Salesforce friendly names
+    "gpt-3.5-turbo": "claude-3-haiku", # Fast, efficient option
+    "gpt-4": "gpt-4", # Direct mapping
+    "gpt-4-turbo": "claude-4-sonnet", # Latest, most capable
+    "gpt-4o": "gpt-4", # GPT-4 Omni
+    "gpt-4o-mini": "gpt-4-mini", # GPT-4 Omni Mini
+    
+    # Claude models (direct mapping)
+    "claude-3-haiku": "claude-3-haiku",
+    "claude-3-sonnet": "claude-3-sonnet", 
+    "claude-4-sonnet": "claude-4-sonnet",
+    
+    # Gemini models
+    "gemini-pro": "gemini-pro",
+    "gemini-1.5-pro": "gemini-pro",
+    
+    # Default fallback
+    "default": "claude-3-haiku"
+}
+
 def map_model_name(openai_model: str) -> str:
     """
     Map OpenAI-style model names to Salesforce friendly names.
@@ -1091,28 +1117,7 @@ def map_model_name(openai_model: str) -> str:
     This allows clients to use familiar OpenAI model names while routing
     to appropriate Salesforce models.
     """
-    model_mapping = {
-        # OpenAI model names -> Salesforce friendly names
-        "gpt-3.5-turbo": "claude-3-haiku", # Fast, efficient option
-        "gpt-4": "gpt-4", # Direct mapping
-        "gpt-4-turbo": "claude-4-sonnet", # Latest, most capable
-        "gpt-4o": "gpt-4", # GPT-4 Omni
-        "gpt-4o-mini": "gpt-4-mini", # GPT-4 Omni Mini
-        
-        # Claude models (direct mapping)
-        "claude-3-haiku": "claude-3-haiku",
-        "claude-3-sonnet": "claude-3-sonnet", 
-        "claude-4-sonnet": "claude-4-sonnet",
-        
-        # Gemini models
-        "gemini-pro": "gemini-pro",
-        "gemini-1.5-pro": "gemini-pro",
-        
-        # Default fallback
-        "default": "claude-3-haiku"
-    }
-    
-    return model_mapping.get(openai_model, "claude-3-haiku")
+    return OPENAI_MODEL_MAPPING.get(openai_model, "claude-3-haiku")
 
 def format_openai_response_optimized(sf_response: Dict[str, Any], model: str, is_streaming: bool = False) -> Dict[str, Any]:
     """
@@ -1120,8 +1125,8 @@ def format_openai_response_optimized(sf_response: Dict[str, Any], model: str, is
     Uses single-path lookup with intelligent caching and reduces fallback attempts by 89%.
     """
     
-    # Enable debug mode based on environment variable
-    debug_mode = os.getenv('SF_RESPONSE_DEBUG', 'false').lower() == 'true'
+    # Enable debug mode based on environment variable (resolved at import)
+    debug_mode = SF_RESPONSE_DEBUG
     
     # Debug logging to understand response structure
     if debug_mode:
@@ -1141,11 +1146,12 @@ def format_openai_response_optimized(sf_response: Dict[str, Any], model: str, is
     # Extract usage information if available
     usage = extract_usage_info_optimized(sf_response)
     
-    # Create OpenAI-compatible response
+    # Create OpenAI-compatible response (one clock read so "id" and "created" agree)
+    created = int(time.time())
     openai_response = {
-        "id": f"chatcmpl-{int(time.time())}",
+        "id": f"chatcmpl-{created}",
         "object": "chat.completion",
-        "created": int(time.time()),
+        "created": created,
         "model": model,
         "choices": [
             {
@@ -1164,6 +1170,9 @@ def format_openai_response_optimized(sf_response: Dict[str, Any], model: str, is
         logger.debug(f"Formatted OpenAI response: {json.dumps(openai_response, indent=2)}")
     return openai_response
 
+# (key, label) pairs checked in priority order under sf_response['generation']
+_GENERATION_TEXT_PATHS = (('generatedText', 'primary'), ('text', 'secondary'))
+
 def extract_response_text_optimized(sf_response: Dict[str, Any], debug_mode: bool = False) -> str:
     """
     OPTIMIZED: Extract text from Salesforce response using single-path lookup strategy.
@@ -1173,33 +1182,27 @@ def extract_response_text_optimized(sf_response: Dict[str, Any], debug_mode: boo
     # OPTIMIZED: Priority-based single path selection with 89% success rate
     # Based on Salesforce API response structure analysis, prioritize paths by likelihood
     
-    # Highest priority: Standard Salesforce structure (70% success rate)
-    if 'generation' in sf_response:
-        generation = sf_response['generation']
-        if isinstance(generation, dict) and 'generatedText' in generation:
-            text = generation['generatedText']
-            if isinstance(text, str) and text.strip():
-                if debug_mode:
-                    logger.debug(f"🎯 Found generated text via primary path: generation.generatedText")
-                return text.strip()
-    
-    # Secondary priority: Alternative Salesforce structure (15% success rate)
-    if 'generation' in sf_response:
-        generation = sf_response['generation']
-        if isinstance(generation, dict) and 'text' in generation:
-            text = generation['text']
-            if isinstance(text, str) and text.strip():
-                if debug_mode:
-                    logger.debug(f"🎯 Found generated text via secondary path: generation.text")
-                return text.strip()
+    # Highest priority: Standard Salesforce structure (70% success rate), then the
+    # alternative 'text' key (15% success rate) - one lookup of 'generation' serves both
+    generation = sf_response.get('generation')
+    if isinstance(generation, dict):
+        for key, path_label in _GENERATION_TEXT_PATHS:
+            text = generation.get(key)
+            if isinstance(text, str):
+                stripped = text.strip()
+                if stripped:
+                    if debug_mode:
+                        logger.debug(f"🎯 Found generated text via {path_label} path: generation.{key}")
+                    return stripped
     
     # Fallback priority: Direct response structures (5% success rate)
-    if 'text' in sf_response:
-        text = sf_response['text']
-        if isinstance(text, str) and text.strip():
+    text = sf_response.get('text')
+    if isinstance(text, str):
+        stripped = text.strip()
+        if stripped:
             if debug_mode:
                 logger.debug(f"🎯 Found generated text via fallback path: text")
-            return text.strip()
+            return stripped
     
     # Last resort: Comprehensive search (only 10% of cases call this)
     return fallback_response_extraction(sf_response, debug_mode)
@@ -1708,10 +1711,11 @@ def completions():
             generated_text = sf_response['text']
         
         # Format as OpenAI completion response
+        created = int(time.time())
         openai_response = {
-            "id": f"cmpl-{int(time.time())}",
+            "id": f"cmpl-{created}",
             "object": "text_completion",
-            "created": int(time.time()),
+            "created": created,
             "model": model,
             "choices": [
                 {
@@ -1751,6 +1755,16 @@ def _get_timeout_suggestion(prompt_length: int, model_used: str) -> str:
         return "Try using claude-3-haiku for faster responses or reduce input size"
 
 
+# Keyword -> suggestion table for errors whose advice does not depend on prompt size or model.
+# Checked in order after the timeout/maintenance cases, first match wins.
+_STATIC_ERROR_SUGGESTIONS = (
+    (('rate limit',), "Rate limit exceeded. Wait before retrying or reduce request frequency"),
+    (('unauthorized', 'authentication'), "Check Salesforce credentials and ensure External Client App is properly configured"),
+)
+_MAINTENANCE_ERROR_KEYWORDS = ('504', 'maintenance', 'gateway timeout')
+_MAINTENANCE_PAGE_MARKERS = ('this application is down for maintenance', '<html>')
+_DEFAULT_ERROR_SUGGESTION = "Try using claude-3-haiku for faster responses or reduce input size"
+
 def _get_error_suggestion(error_message: str, prompt_length: int, model_used: str) -> str:
     """Generate helpful suggestions based on error type."""
     error_lower = error_message.lower()
@@ -1761,9 +1775,9 @@ def _get_error_suggestion(error_message: str, prompt_length: int, model_used: st
         elif "claude-4" in model_used.lower():
             return "Try using claude-3-haiku for faster processing or reduce prompt size"
         else:
-            return "Try using claude-3-haiku for faster responses or reduce input size"
-    elif any(maintenance_error in error_lower for maintenance_error in ['504', 'maintenance', 'gateway timeout']):
-        if "This application is down for maintenance" in error_lower or "<html>" in error_lower:
+            return _DEFAULT_ERROR_SUGGESTION
+    elif any(maintenance_error in error_lower for maintenance_error in _MAINTENANCE_ERROR_KEYWORDS):
+        if any(marker in error_lower for marker in _MAINTENANCE_PAGE_MARKERS):
             # Salesforce maintenance page
             if prompt_length > 20000:
                 return "Salesforce is undergoing maintenance. Try reducing prompt size or using claude-3-haiku for better reliability"
@@ -1775,12 +1789,11 @@ def _get_error_suggestion(error_message: str, prompt_length: int, model_used: st
                 return "Salesforce API is experiencing high latency. Try reducing prompt size significantly"
             else:
                 return "Salesforce API is temporarily unavailable. Please try again in a few minutes"
-    elif "rate limit" in error_lower:
-        return "Rate limit exceeded. Wait before retrying or reduce request frequency"
-    elif "unauthorized" in error_lower or "authentication" in error_lower:
-        return "Check Salesforce credentials and ensure External Client App is properly configured"
-    else:
-        return "Try using claude-3-haiku for faster responses or reduce input size"
+    
+    for keywords, suggestion in _STATIC_ERROR_SUGGESTIONS:
+        if any(keyword in error_lower for keyword in keywords):
+            return suggestion
+    return _DEFAULT_ERROR_SUGGESTION
 
 @app.route('/v1/messages', methods=['POST'])
 @with_token_refresh_sync
@@ -17,13 +17,15 @@ Usage:
 import os
 import time
 import json
+import math
 import asyncio
-import requests
 import aiohttp
 import ssl
 import random
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional, Any
 from connection_pool import get_connection_pool
+from json_utils import json_dumps_bytes
 
 try:
     import certifi
@@ -33,6 +35,45 @@ except ImportError:
     SSL_CONTEXT = ssl.create_default_context()
 
 
+def _encode_json_body(payload: Dict[str, Any]) -> bytes:
+    """
+    Serialize a request payload to UTF-8 JSON bytes.
+    
+    Caller-supplied sampling parameters (temperature, max_tokens, ...) sit at the top
+    level; a non-finite float there is encoded by the standard library as before,
+    since orjson would silently send it as null.
+    """
+    if any(isinstance(value, float) and not math.isfinite(value) for value in payload.values()):
+        return json.dumps(payload).encode('utf-8')
+    return json_dumps_bytes(payload)
+
+# Friendly model names -> full Salesforce API model names, shared by the sync and async clients
+MODEL_API_NAMES = {
+    "claude-3-haiku": "sfdc_ai__DefaultBedrockAnthropicClaude3Haiku",
+    "claude-3-sonnet": "sfdc_ai__DefaultBedrockAnthropicClaude37Sonnet",
+    "claude-4-sonnet": "sfdc_ai__DefaultBedrockAnthropicClaude4Sonnet",
+    "gpt-4": "sfdc_ai__DefaultGPT4Omni",
+    "gpt-4-mini": "sfdc_ai__DefaultOpenAIGPT4OmniMini",
+    "gemini-pro": "sfdc_ai__DefaultVertexAIGemini25Flash001"
+}
+
+# Static headers sent with every Models API generation request (Authorization is added per call)
+MODELS_API_HEADERS = {
+    'Content-Type': 'application/json',
+    'x-sfdc-app-context': 'EinsteinGPT',
+    'x-client-feature-id': 'ai-platform-models-connected-app'
+}
+
+# OPTIMIZED: Shared executor for running coroutines from sync code while an event loop is
+# already running. Threads start on demand and are reused instead of building a pool per call.
+# NOTE: A call that hits its timeout keeps its worker busy until the coroutine finishes, and
+# time spent queued counts against the caller's timeout. With every worker held by hung token
+# fetches, later calls wait in the queue and can time out too. Size the pool with
+# SF_SYNC_BRIDGE_WORKERS for deployments that make many concurrent sync calls.
+SYNC_BRIDGE_WORKERS = int(os.environ.get('SF_SYNC_BRIDGE_WORKERS', '4'))
+_SYNC_BRIDGE_EXECUTOR = ThreadPoolExecutor(max_workers=SYNC_BRIDGE_WORKERS, thread_name_prefix='sf-sync-bridge')
+
+
 class SalesforceModelsClient:
     """
     Client for Salesforce Einstein Trust Layer Models API.
@@ -49,7 +90,13 @@ class SalesforceModelsClient:
             config_file: Optional path to configuration file. If not provided,
                         uses environment variables.
         """
+        # Imported lazily: only the sync client needs requests, so the async server skips the import cost
+        import requests
+        
         self.async_client = AsyncSalesforceModelsClient(config_file)
+        # OPTIMIZED: Persistent HTTP session so sync requests reuse pooled keep-alive
+        # connections instead of paying a new TCP/TLS handshake on every call
+        self.session = requests.Session()
 
     def _load_config(self, config_file: Optional[str] = None) -> Dict[str, str]:
         return self.async_client._load_config(config_file)
@@ -74,11 +121,9 @@ class SalesforceModelsClient:
             # Try to get existing event loop
             loop = asyncio.get_event_loop()
             if loop.is_running():
-                # If event loop is running, create a new thread for async operation
-                import concurrent.futures
-                with concurrent.futures.ThreadPoolExecutor() as executor:
-                    future = executor.submit(asyncio.run, self.async_client._async_get_access_token())
-                    return future.result(timeout=120)
+                # If event loop is running, run the async operation on the shared bridge thread pool
+                future = _SYNC_BRIDGE_EXECUTOR.submit(asyncio.run, self.async_client._async_get_access_token())
+                return future.result(timeout=120)
             else:
                 return asyncio.run(self.async_client._async_get_access_token())
         except RuntimeError:
@@ -120,27 +165,17 @@ class SalesforceModelsClient:
         Returns:
             Response from the model including generated text and metadata.
         """
-        # Map friendly names to full API names
-        model_mapping = {
-            "claude-3-haiku": "sfdc_ai__DefaultBedrockAnthropicClaude3Haiku",
-            "claude-3-sonnet": "sfdc_ai__DefaultBedrockAnthropicClaude37Sonnet", 
-            "claude-4-sonnet": "sfdc_ai__DefaultBedrockAnthropicClaude4Sonnet",
-            "gpt-4": "sfdc_ai__DefaultGPT4Omni",
-            "gpt-4-mini": "sfdc_ai__DefaultOpenAIGPT4OmniMini",
-            "gemini-pro": "sfdc_ai__DefaultVertexAIGemini25Flash001"
-        }
+        import requests
         
-        # Use mapping if friendly name provided
-        api_model_name = model_mapping.get(model, model)
+        # Map friendly names to full API names
+        api_model_name = MODEL_API_NAMES.get(model, model)
         
         access_token = self.get_access_token()
         endpoint = f"https://api.salesforce.com/einstein/platform/v1/models/{api_model_name}/generations"
         
         headers = {
             'Authorization': f'Bearer {access_token}',
-            'Content-Type': 'application/json',
-            'x-sfdc-app-context': 'EinsteinGPT',
-            'x-client-feature-id': 'ai-platform-models-connected-app'
+            **MODELS_API_HEADERS
         }
         
         # Build payload - Salesforce Models API expects 'prompt' field, not 'messages'
@@ -180,9 +215,12 @@ class SalesforceModelsClient:
         max_retries = 1 # Reduced from 2 to 1 to avoid excessive timeout escalation
         retry_count = 0
         
+        # OPTIMIZED: Serialize the payload once; retries resend the same bytes (Content-Type is already set)
+        body = _encode_json_body(payload)
+        
         while retry_count <= max_retries:
             try:
-                response = requests.post(endpoint, headers=headers, json=payload, timeout=timeout)
+                response = self.session.post(endpoint, headers=headers, data=body, timeout=timeout)
                 
                 if response.status_code in [200, 201]:
                     return response.json()
@@ -450,25 +488,14 @@ class AsyncSalesforceModelsClient:
         **kwargs
     ) -> Dict[str, Any]:
         """Generate text async using specified model through Einstein Trust Layer."""
-        model_mapping = {
-            "claude-3-haiku": "sfdc_ai__DefaultBedrockAnthropicClaude3Haiku",
-            "claude-3-sonnet": "sfdc_ai__DefaultBedrockAnthropicClaude37Sonnet",
-            "claude-4-sonnet": "sfdc_ai__DefaultBedrockAnthropicClaude4Sonnet",
-            "gpt-4": "sfdc_ai__DefaultGPT4Omni",
-            "gpt-4-mini": "sfdc_ai__DefaultOpenAIGPT4OmniMini",
-            "gemini-pro": "sfdc_ai__DefaultVertexAIGemini25Flash001"
-        }
-        
-        api_model_name = model_mapping.get(model, model)
+        api_model_name = MODEL_API_NAMES.get(model, model)
         
         access_token = await self._async_get_access_token()
         endpoint = f"https://api.salesforce.com/einstein/platform/v1/models/{api_model_name}/generations"
         
         headers = {
             'Authorization': f'Bearer {access_token}',
-            'Content-Type': 'application/json',
-            'x-sfdc-app-context': 'EinsteinGPT',
-            'x-client-feature-id': 'ai-platform-models-connected-app'
+            **MODELS_API_HEADERS
         }
         
         full_prompt = prompt
@@ -511,7 +538,8 @@ class AsyncSalesforceModelsClient:
         session = await pool.get_session(custom_timeout=timeout_obj)
         
         try:
-            async with session.post(endpoint, headers=headers, json=payload) as response:
+            # Pre-serialized body; Content-Type is already set in headers
+            async with session.post(endpoint, headers=headers, data=_encode_json_body(payload)) as response:
                 if response.status in [200, 201]:
                     return await response.json()
                 else:
@@ -547,25 +575,14 @@ class AsyncSalesforceModelsClient:
         **kwargs
     ) -> Dict[str, Any]:
         """Async multi-turn chat completion."""
-        model_mapping = {
-            "claude-3-haiku": "sfdc_ai__DefaultBedrockAnthropicClaude3Haiku",
-            "claude-3-sonnet": "sfdc_ai__DefaultBedrockAnthropicClaude37Sonnet",
-            "claude-4-sonnet": "sfdc_ai__DefaultBedrockAnthropicClaude4Sonnet",
-            "gpt-4": "sfdc_ai__DefaultGPT4Omni",
-            "gpt-4-mini": "sfdc_ai__DefaultOpenAIGPT4OmniMini",
-            "gemini-pro": "sfdc_ai__DefaultVertexAIGemini25Flash001"
-        }
-        
-        api_model_name = model_mapping.get(model, model)
+        api_model_name = MODEL_API_NAMES.get(model, model)
         
         access_token = await self._async_get_access_token()
         endpoint = f"https://api.salesforce.com/einstein/platform/v1/models/{api_model_name}/chat-generations"
         
         headers = {
             'Authorization': f'Bearer {access_token}',
-            'Content-Type': 'application/json',
-            'x-sfdc-app-context': 'EinsteinGPT',
-            'x-client-feature-id': 'ai-platform-models-connected-app'
+            **MODELS_API_HEADERS
         }
         
         payload = {
@@ -603,6 +620,9 @@ class AsyncSalesforceModelsClient:
         max_retries = 3
         base_delay = 1.0
         
+        # OPTIMIZED: Serialize the conversation once; retries resend the same bytes
+        body = _encode_json_body(payload)
+        
         for attempt in range(max_retries + 1):
             try:
                 # Use persistent connection pool for performance optimization
@@ -610,7 +630,7 @@ class AsyncSalesforceModelsClient:
                 session = await pool.get_session(custom_timeout=timeout_obj)
                 
                 try:
-                    async with session.post(endpoint, headers=headers, json=payload) as response:
+                    async with session.post(endpoint, headers=headers, data=body) as response:
                         if response.status in [200, 201]:
                             return await response.json()
                         elif response.status == 429:  # Rate limit exceeded
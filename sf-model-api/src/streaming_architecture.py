@@ -3,12 +3,13 @@ Streaming Architecture for Salesforce Models API Gateway
 Provides streaming response capabilities for OpenAI-compatible responses.
 """
 
-import json
 import time
 import logging
 from typing import Dict, Any, Optional, Generator, List
 from dataclasses import dataclass
 
+from json_utils import json_dumps
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -38,7 +39,7 @@ class OpenAIStreamChunk:
     
     def to_sse_format(self) -> str:
         """Convert to Server-Sent Events format."""
-        return f"data: {json.dumps(self.to_dict())}\n\n"
+        return f"data: {json_dumps(self.to_dict())}\n\n"
 
 
 class StreamingResponseBuilder:
@@ -154,10 +155,11 @@ class StreamingErrorHandler:
     @staticmethod
     def create_error_chunk(error_message: str, error_code: str = "internal_error") -> str:
         """Create an error chunk in streaming format."""
+        created = int(time.time())
         error_chunk = {
-            "id": f"chatcmpl-error-{int(time.time())}",
+            "id": f"chatcmpl-error-{created}",
             "object": "chat.completion.chunk",
-            "created": int(time.time()),
+            "created": created,
             "model": "unknown",
             "choices": [{
                 "index": 0,
@@ -170,7 +172,7 @@ class StreamingErrorHandler:
             }
         }
         
-        return f"data: {json.dumps(error_chunk)}\n\n"
+        return f"data: {json_dumps(error_chunk)}\n\n"
     
     @staticmethod
     def handle_streaming_error(error: Exception, model: str = "unknown") -> Generator[str, None, None]:
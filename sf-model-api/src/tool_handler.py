@@ -18,6 +18,8 @@ from typing import Dict, Any, List, Optional, Union, Generator
 from enum import Enum
 import logging
 
+from json_utils import json_dumps, json_loads
+
 from tool_schemas import (
     FunctionDefinition,
     ToolDefinition,
@@ -37,6 +39,9 @@ from tool_executor import ToolExecutor
 
 logger = logging.getLogger(__name__)
 
+# Top-level keys every OpenAI chat.completion.chunk must carry
+OPENAI_CHUNK_REQUIRED_FIELDS = frozenset({'id', 'object', 'created', 'model', 'choices'})
+
 
 class ToolCallingMode(Enum):
     """Tool calling modes."""
@@ -186,6 +191,9 @@ class ToolCallingHandler:
     Implements regex pattern caching and enhanced performance optimizations.
     """
     
+    # Compiled regex patterns shared by every handler instance (built on first use)
+    _shared_regex_patterns: Optional[Dict[str, Any]] = None
+    
     def __init__(self, config: ToolCallingConfig):
         self.config = config
         self.executor = ToolExecutor(config)
@@ -204,7 +212,14 @@ class ToolCallingHandler:
         """
         OPTIMIZED: Pre-compile all regex patterns at startup to eliminate runtime compilation overhead.
         Provides 60-80% performance improvement for n8n parameter extraction.
+        
+        Patterns are compiled once per process and shared at class scope, so additional
+        handlers (e.g. the one owned by ToolStreamingHandler) reuse them for free.
         """
+        if ToolCallingHandler._shared_regex_patterns is not None:
+            self.regex_patterns = ToolCallingHandler._shared_regex_patterns
+            return
+        
         import re
         
         # Cache all regex patterns used throughout the handler
@@ -213,6 +228,8 @@ class ToolCallingHandler:
             'fromai_standard': re.compile(r'\{\{ \$fromAI\([\'"]([^\'"]+)[\'"],\s*[\'"]([^\'"]*)[\'"],\s*[\'"]([^\'"]*)[\'"]\) \}\}'),
             'fromai_no_default': re.compile(r'\{\{ \$fromAI\([\'"]([^\'"]+)[\'"],\s*[\'"]([^\'"]*)[\'"]\) \}\}'),
             'fromai_simple': re.compile(r'\$fromAI\([\'"]([^\'"]+)[\'"\)]'),
+            'fromai_single_arg': re.compile(r'\$fromAI\([\'"]([^\'"]+)[\'"]\)'),
+            'fromai_strip': re.compile(r'\{\{ \$fromAI\([^}]*\)\}'), # Removes references before value analysis
             
             # Parameter extraction patterns
             'param_extraction': {
@@ -240,6 +257,7 @@ class ToolCallingHandler:
             }
         }
         
+        ToolCallingHandler._shared_regex_patterns = self.regex_patterns
         logger.info("✅ Regex patterns pre-compiled and cached (performance optimization)")
     
     def get_cached_pattern(self, pattern_name: str):
@@ -678,19 +696,17 @@ class ToolCallingHandler:
         """Extract automatic parameter values from user message and context."""
         extracted_params = {}
         
-        import re
-        
-        # Extract all $fromAI() references
-        fromai_patterns = [
-            r'\{\{ \$fromAI\([\'"]([^\'"]+)[\'"],\s*[\'"]([^\'"]*)[\'"],\s*[\'"]([^\'"]*)[\'"]\) \}\}',
-            r'\{\{ \$fromAI\([\'"]([^\'"]+)[\'"],\s*[\'"]([^\'"]*)[\'"]\) \}\}',
-            r'\$fromAI\([\'"]([^\'"]+)[\'"]\)'
-        ]
+        # OPTIMIZED: Extract all $fromAI() references with the pre-compiled patterns
+        fromai_patterns = (
+            self.get_cached_pattern('fromai_standard'),
+            self.get_cached_pattern('fromai_no_default'),
+            self.get_cached_pattern('fromai_single_arg')
+        )
         
         # Find all parameter names that need automatic determination
         auto_params = set()
         for pattern in fromai_patterns:
-            matches = re.findall(pattern, content)
+            matches = pattern.findall(content)
             for match in matches:
                 if isinstance(match, tuple):
                     auto_params.add(match[0])
@@ -722,7 +738,7 @@ class ToolCallingHandler:
         import re
         
         # Remove $fromAI() references for cleaner analysis
-        clean_content = re.sub(r'\{\{ \$fromAI\([^}]*\)\}', '', content)
+        clean_content = self.get_cached_pattern('fromai_strip').sub('', content)
         
         param_value = None
         
@@ -775,12 +791,10 @@ class ToolCallingHandler:
     def _generate_default_value(self, param_name: str, param_type: str, content: str) -> str:
         """Generate a default value for parameters that couldn't be extracted."""
         
-        import re
-        
         # For System_Message, extract from the main user message context
         if "system" in param_name.lower() or "message" in param_name.lower():
             # Extract a reasonable system message from the content
-            clean_content = re.sub(r'\{\{ \$fromAI\([^}]*\)\}', '', content)
+            clean_content = self.get_cached_pattern('fromai_strip').sub('', content)
             if clean_content.strip():
                 return clean_content.strip()[:500] # Limit length
             else:
@@ -801,41 +815,29 @@ class ToolCallingHandler:
     def _contextual_extraction(self, param_name: str, param_type: str, content: str) -> Optional[str]:
         """Extract parameter value based on contextual clues."""
         content_lower = content.lower()
+        # OPTIMIZED: Use the pre-compiled contextual patterns; search() stops at the first hit
+        contextual_patterns = self.get_cached_pattern('contextual')
         
         # Common parameter extractions based on names and context
         if any(word in param_name.lower() for word in ['name', 'username', 'user']):
-            # Look for names in the content
-            import re
-            name_patterns = [
-                r'([A-Z][a-z]+ [A-Z][a-z]+)', # Full name
-                r'([A-Z][a-z]+)', # First name
-            ]
-            for pattern in name_patterns:
-                names = re.findall(pattern, content)
-                if names:
-                    return names[0]
+            # Look for names in the content (full name first, then first name)
+            for pattern_name in ('names', 'first_name'):
+                match = contextual_patterns[pattern_name].search(content)
+                if match:
+                    return match.group(1)
         
         elif any(word in param_name.lower() for word in ['email', 'mail']):
             # Look for email addresses
-            import re
-            emails = re.findall(r'([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})', content)
-            if emails:
-                return emails[0]
+            match = contextual_patterns['emails'].search(content)
+            if match:
+                return match.group(1)
         
         elif any(word in param_name.lower() for word in ['key', 'api', 'token']):
-            # Look for API keys or tokens
-            import re
-            # Common patterns for keys, tokens, IDs
-            key_patterns = [
-                r'([a-zA-Z0-9]{8}-?[a-zA-Z0-9]{4}-?[a-zA-Z0-9]{4}-?[a-zA-Z0-9]{4}-?[a-zA-Z0-9]{12})', # UUID-like
-                r'([a-zA-Z0-9]{32})', # 32-character hex
-                r'([a-zA-Z0-9+/]{20,}=*)', # Base64-like
-                r'([a-zA-Z][a-zA-Z0-9_]{5,20})', # Generic ID
-            ]
-            for pattern in key_patterns:
-                keys = re.findall(pattern, content)
-                if keys:
-                    return keys[0]
+            # Look for API keys or tokens: UUID-like, 32-char hex, Base64-like, generic ID
+            for pattern_name in ('keys_uuid', 'keys_hex', 'keys_base64', 'keys_generic'):
+                match = contextual_patterns[pattern_name].search(content)
+                if match:
+                    return match.group(1)
         
         elif any(word in param_name.lower() for word in ['subject']):
             # Extract subject from context
@@ -847,8 +849,7 @@ class ToolCallingHandler:
         elif any(word in param_name.lower() for word in ['message', 'content', 'body']):
             # Extract main message content
             # Remove $fromAI references and take the core message
-            import re
-            cleaned = re.sub(r'\{\{ \$fromAI\([^}]*\)\}', '', content)
+            cleaned = self.get_cached_pattern('fromai_strip').sub('', content)
             if cleaned.strip():
                 return cleaned.strip()[:200] # Limit length
         
@@ -990,7 +991,7 @@ class ToolCallingHandler:
                         "type": "function",
                         "function": {
                             "name": call.function_name,
-                            "arguments": json.dumps(call.function_arguments)
+                            "arguments": call.function_arguments_json
                         }
                     }
                     for call in tool_calls
@@ -999,10 +1000,12 @@ class ToolCallingHandler:
             "finish_reason": "tool_calls"
         }
         
+        # Single timestamp so "id" and "created" always agree
+        created = int(time.time())
         response = {
-            "id": f"chatcmpl-{int(time.time())}",
+            "id": f"chatcmpl-{created}",
             "object": "chat.completion",
-            "created": int(time.time()),
+            "created": created,
             "model": model,
             "choices": [choice],
             "usage": {
@@ -1097,10 +1100,11 @@ class ToolCallingHandler:
     
     def _format_error_response(self, error_message: str, model: str) -> Dict[str, Any]:
         """Format error response."""
+        created = int(time.time())
         return {
-            "id": f"chatcmpl-{int(time.time())}",
+            "id": f"chatcmpl-{created}",
             "object": "chat.completion",
-            "created": int(time.time()),
+            "created": created,
             "model": model,
             "choices": [
                 {
@@ -1223,6 +1227,7 @@ class ToolStreamingHandler:
             
             # Parse arguments for incremental streaming
             try:
+                # Stdlib parser keeps integers wider than 64 bits exact (orjson rounds them)
                 args_dict = json.loads(function_arguments)
             except json.JSONDecodeError:
                 args_dict = {}
@@ -1256,7 +1261,7 @@ class ToolStreamingHandler:
             current_args[arg_name] = arg_value
             
             # Send incremental argument update
-            args_json = json.dumps(current_args)
+            args_json = json_dumps(current_args)
             yield self._format_tool_call_delta_chunk(
                 index=index,
                 tool_call_id=tool_call_id,
@@ -1345,7 +1350,7 @@ class ToolStreamingHandler:
                 "finish_reason": None
             }]
         }
-        return f"data: {json.dumps(chunk)}\n\n"
+        return f"data: {json_dumps(chunk)}\n\n"
     
     def _format_content_chunk(self, content: str, response: Dict[str, Any], stream_id: str) -> str:
         """Format a content delta chunk."""
@@ -1360,7 +1365,7 @@ class ToolStreamingHandler:
                 "finish_reason": None
             }]
         }
-        return f"data: {json.dumps(chunk)}\n\n"
+        return f"data: {json_dumps(chunk)}\n\n"
     
     def _format_tool_call_delta_chunk(self, index: int, tool_call_id: str, function_name: str,
                                       arguments_json: str, stream_id: str, response: Dict[str, Any]) -> str:
@@ -1386,7 +1391,7 @@ class ToolStreamingHandler:
                 "finish_reason": None
             }]
         }
-        return f"data: {json.dumps(chunk)}\n\n"
+        return f"data: {json_dumps(chunk)}\n\n"
     
     def _format_execution_progress_chunk(self, tool_call_id: str, function_name: str,
                                          status: str, message: str, stream_id: str,
@@ -1405,7 +1410,7 @@ class ToolStreamingHandler:
                 "finish_reason": None
             }]
         }
-        return f"data: {json.dumps(chunk)}\n\n"
+        return f"data: {json_dumps(chunk)}\n\n"
     
     def _format_finish_chunk(self, finish_reason: str, response: Dict[str, Any], stream_id: str) -> str:
         """Format the final chunk with finish reason."""
@@ -1420,14 +1425,15 @@ class ToolStreamingHandler:
                 "finish_reason": finish_reason
             }]
         }
-        return f"data: {json.dumps(chunk)}\n\n"
+        return f"data: {json_dumps(chunk)}\n\n"
     
     def _format_error_chunk(self, error_message: str, **kwargs) -> str:
         """Format error chunk."""
+        created = int(time.time())
         chunk = {
-            "id": f"chatcmpl-{int(time.time())}",
+            "id": f"chatcmpl-{created}",
             "object": "chat.completion.chunk",
-            "created": int(time.time()),
+            "created": created,
             "model": kwargs.get('model', 'claude-3-haiku'),
             "choices": [{
                 "index": 0,
@@ -1435,7 +1441,7 @@ class ToolStreamingHandler:
                 "finish_reason": "stop"
             }]
         }
-        return f"data: {json.dumps(chunk)}\n\n"
+        return f"data: {json_dumps(chunk)}\n\n"
     
     def _generate_stream_id(self) -> str:
         """Generate a unique stream ID."""
@@ -1508,17 +1514,13 @@ def validate_openai_streaming_format(chunk_data: str) -> bool:
         if not chunk_data.startswith('data: '):
             return False
         
-        json_str = chunk_data[6:] # Remove 'data: ' prefix
-        if json_str.endswith('\\n\\n'):
-            json_str = json_str[:-2] # Remove trailing newlines
-        elif json_str.endswith('\\n'):
-            json_str = json_str[:-1] # Remove single newline
+        json_str = chunk_data[6:].rstrip('\n') # Remove 'data: ' prefix and trailing newlines
         
-        chunk = json.loads(json_str)
+        # OPTIMIZED: orjson-backed parse when available
+        chunk = json_loads(json_str)
         
-        # Validate required fields
-        required_fields = ['id', 'object', 'created', 'model', 'choices']
-        if not all(field in chunk for field in required_fields):
+        # Validate required fields (OPTIMIZED: single set comparison against the key view)
+        if not OPENAI_CHUNK_REQUIRED_FIELDS <= chunk.keys():
             return False
         
         # Validate object type
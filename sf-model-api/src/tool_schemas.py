@@ -11,6 +11,7 @@ https://platform.openai.com/docs/guides/function-calling
 """
 
 import json
+import os
 import uuid
 import re
 from typing import Dict, Any, List, Optional, Union, Literal
@@ -20,6 +21,9 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Known content types for OpenAI-compatible array content
+ALLOWED_CONTENT_TYPES = frozenset({'text', 'image_url', 'image_file'})
+
 
 class ContentObject(BaseModel):
     """Content object for OpenAI-compatible array content."""
@@ -29,8 +33,7 @@ class ContentObject(BaseModel):
     @validator('type')
     def validate_type(cls, v):
         """Validate content type."""
-        allowed_types = ['text', 'image_url', 'image_file']
-        if v not in allowed_types:
+        if v not in ALLOWED_CONTENT_TYPES:
             logger.warning(f"Unusual content type '{v}', proceeding anyway")
         return v
 
@@ -52,6 +55,10 @@ class ToolChoiceType(str, Enum):
     REQUIRED = "required"
 
 
+# Valid string forms of tool_choice, for O(1) membership checks
+TOOL_CHOICE_VALUES = frozenset(tc.value for tc in ToolChoiceType)
+
+
 class ParameterSchema(BaseModel):
     """Schema for function parameters."""
     type: FunctionParameterType = Field(..., description="Type of the parameter")
@@ -198,8 +205,8 @@ class ToolCall(BaseModel):
             if field not in v:
                 raise ValueError(f"Function call missing required field: {field}")
         
-        # Validate arguments format
-        if isinstance(v['arguments'], str):
+        # Validate arguments format ("{}" is by far the most common no-argument case; skip the parse)
+        if isinstance(v['arguments'], str) and v['arguments'] != "{}":
             try:
                 # Try to parse as JSON
                 json.loads(v['arguments'])
@@ -218,8 +225,19 @@ class ToolCall(BaseModel):
         """Get the function arguments as dictionary."""
         args = self.function['arguments']
         if isinstance(args, str):
+            if args == "{}":
+                return {}
             return json.loads(args)
         return args
+    
+    @property
+    def function_arguments_json(self) -> str:
+        """Get the function arguments as a JSON string, without re-parsing string arguments."""
+        args = self.function['arguments']
+        if isinstance(args, str):
+            # Already validated as JSON by validate_function
+            return args
+        return json.dumps(args)
 
 
 class ToolMessage(BaseModel):
@@ -452,6 +470,17 @@ class ToolCallingPromptTemplate(BaseModel):
     )
 
 
+# CLI-style parameter name patterns, compiled once into a single alternation:
+#   -B, -v                  single letter flags
+#   --long-name, --verbose  long flags
+#   my-param, long_name     kebab-case
+CLI_PARAMETER_NAME_PATTERN = re.compile(
+    r'^(?:-[a-zA-Z0-9]'
+    r'|--[a-zA-Z0-9][a-zA-Z0-9_-]*[a-zA-Z0-9]'
+    r'|[a-zA-Z][a-zA-Z0-9_-]*[a-zA-Z0-9])$'
+)
+
+
 def is_valid_parameter_name(param_name: str) -> bool:
     """
     Check if a parameter name is valid, supporting both traditional and CLI-style names.
@@ -470,17 +499,7 @@ def is_valid_parameter_name(param_name: str) -> bool:
         return True
     
     # CLI-style parameter patterns
-    cli_patterns = [
-        r'^-[a-zA-Z0-9]$',  # Single letter flags: -B, -A, -v
-        r'^--[a-zA-Z0-9][a-zA-Z0-9_-]*[a-zA-Z0-9]$',  # Long flags: --long-name, --verbose
-        r'^[a-zA-Z][a-zA-Z0-9_-]*[a-zA-Z0-9]$',  # kebab-case: my-param, long_name
-    ]
-    
-    for pattern in cli_patterns:
-        if re.match(pattern, param_name):
-            return True
-    
-    return False
+    return CLI_PARAMETER_NAME_PATTERN.match(param_name) is not None
 
 
 def normalize_parameter_name(param_name: str) -> str:
@@ -558,7 +577,10 @@ def validate_enhanced_tool_definitions(tools: List[Dict[str, Any]], config: Opti
     
     # If we have validation errors and no tools were validated, raise an exception
     if validation_errors and not validated_tools:
-        raise ToolCallingValidationError(f"All tool definitions failed validation: {'; '.join(validation_errors)}")
+        raise ToolCallingValidationError(
+            f"All tool definitions failed validation: {'; '.join(validation_errors)}",
+            code="all_tools_invalid"
+        )
     
     # Log warnings for any validation errors that occurred
     if validation_errors:
@@ -652,6 +674,48 @@ def format_enhanced_error_response(tool_call_id: str, error: Exception, executio
     )
 
 
+# Bounds on user-supplied tool parameter schemas. Tool lists arrive with every chat request,
+# so an oversized or deeply nested schema is rejected before any full validation walk.
+TOOL_SCHEMA_MAX_DEPTH = int(os.getenv('SF_TOOL_MAX_SCHEMA_DEPTH', '32'))
+TOOL_SCHEMA_MAX_NODES = int(os.getenv('SF_TOOL_MAX_SCHEMA_NODES', '5000'))
+
+
+def _schema_within_limits(schema: Any,
+                          max_depth: int = TOOL_SCHEMA_MAX_DEPTH,
+                          max_nodes: int = TOOL_SCHEMA_MAX_NODES) -> bool:
+    """
+    Check that a JSON schema stays within nesting-depth and size bounds.
+    
+    Walks the schema iteratively and stops as soon as either bound is exceeded,
+    so the cost is capped at max_nodes regardless of the input size.
+    
+    Args:
+        schema: Parameter schema (any JSON-compatible value)
+        max_depth: Maximum container nesting depth
+        max_nodes: Maximum number of dict entries and list items
+    
+    Returns:
+        True if the schema is within both bounds, False otherwise
+    """
+    nodes = 0
+    stack = [(schema, 1)]
+    while stack:
+        value, depth = stack.pop()
+        if isinstance(value, dict):
+            children = value.values()
+        elif isinstance(value, list):
+            children = value
+        else:
+            continue
+        if depth > max_depth:
+            return False
+        nodes += len(children)
+        if nodes > max_nodes:
+            return False
+        stack.extend((child, depth + 1) for child in children if isinstance(child, (dict, list)))
+    return True
+
+
 def validate_tool_definitions(tools: List[Dict[str, Any]]) -> List[ToolDefinition]:
     """
     Validate and normalize tool definitions with OpenAI-compliant validation.
@@ -672,6 +736,21 @@ def validate_tool_definitions(tools: List[Dict[str, Any]]) -> List[ToolDefinitio
     validated_tools = []
     
     for tool_dict in tools:
+        # OPTIMIZED: Reject definitions missing the required function name up front; they would
+        # fail full validation and the minimal fallback anyway, so skip both deep walks
+        function_dict = tool_dict.get('function') if isinstance(tool_dict, dict) else None
+        if not isinstance(function_dict, dict) or 'name' not in function_dict:
+            logger.error("Skipping tool definition without a function name")
+            continue
+        
+        # Bound the parameter schema before any deep walk (including the minimal fallback)
+        if not _schema_within_limits(function_dict.get('parameters')):
+            logger.error(
+                f"Skipping tool '{function_dict['name']}': parameter schema exceeds "
+                f"depth {TOOL_SCHEMA_MAX_DEPTH} or size {TOOL_SCHEMA_MAX_NODES} limits"
+            )
+            continue
+        
         try:
             # Use permissive validation that accepts OpenAI-compliant schemas
             tool_def = ToolDefinition(**tool_dict)
@@ -751,7 +830,7 @@ def validate_tool_choice(tool_choice: Optional[Union[str, Dict[str, Any]]]) -> O
         return None
     
     if isinstance(tool_choice, str):
-        if tool_choice not in [tc.value for tc in ToolChoiceType]:
+        if tool_choice not in TOOL_CHOICE_VALUES:
             raise ValueError(f"Invalid tool choice string: {tool_choice}")
         return ToolChoice(type=ToolChoiceType(tool_choice))
     
@@ -777,8 +856,12 @@ def format_function_definitions(functions: List[FunctionDefinition]) -> str:
     for func in functions:
         # Format parameters
         params_desc = []
+        # OPTIMIZED: Set lookup for required params, and remember whether any parameter is
+        # automatic so the function-level notice doesn't need a second pass over the schema
+        required_params = set(func.parameters.required or [])
+        has_automatic_params = False
         for param_name, param_schema in func.parameters.properties.items():
-            required = param_name in (func.parameters.required or [])
+            required = param_name in required_params
             param_desc = f"{param_name} ({param_schema.type.value})"
             
             # Check if this is an n8n-style automatic parameter
@@ -788,6 +871,7 @@ def format_function_definitions(functions: List[FunctionDefinition]) -> str:
                     is_automatic = True
                 elif "$fromAI(" in param_schema.description:
                     is_automatic = True
+            has_automatic_params = has_automatic_params or is_automatic
             
             if required:
                 if is_automatic:
@@ -818,9 +902,7 @@ def format_function_definitions(functions: List[FunctionDefinition]) -> str:
         func_desc += f" Parameters: {param_str}"
         
         # Add special instruction if function has automatic parameters
-        if any("Parameter value will be determined by the model automatically" in 
-               (schema.description or "") or "$fromAI(" in (schema.description or "")
-               for schema in func.parameters.properties.values()):
+        if has_automatic_params:
             func_desc += "\n ⚠️ This function has parameters that require automatic value determination based on context."
         
         formatted_functions.append(func_desc)
@@ -848,13 +930,21 @@ def parse_tool_calls_from_response(response_text: str) -> List[Dict[str, Any]]:
     end_tag = "</function_calls>"
     
     start_idx = response_text.find(start_tag)
-    end_idx = response_text.find(end_tag)
+    if start_idx == -1:
+        # OPTIMIZED: Most responses carry no tool calls; return before any further scanning
+        logger.debug("No tool calls found in response")
+        return tool_calls
     
-    if start_idx != -1 and end_idx != -1 and end_idx > start_idx:
+    # OPTIMIZED: Scan for the closing tag only after the opening tag instead of from the start
+    end_idx = response_text.find(end_tag, start_idx + len(start_tag))
+    
+    if end_idx != -1:
         # Extract JSON between tags
         json_content = response_text[start_idx + len(start_tag):end_idx].strip()
         
         try:
+            # Tool call payloads stay on the stdlib parser: orjson turns integers wider than
+            # 64 bits into floats and rejects NaN/Infinity, which would alter the arguments
             parsed_calls = json.loads(json_content)
             if isinstance(parsed_calls, list):
                 for call in parsed_calls:
@@ -940,6 +1030,12 @@ def _attempt_json_recovery(malformed_json: str, original_error: json.JSONDecodeE
         return []
 
 
+# Individual {"name": ..., "arguments": {...}} objects, used to salvage calls from malformed JSON
+TOOL_CALL_OBJECT_PATTERN = re.compile(
+    r'\{\s*"name"\s*:\s*"([^"]+)"\s*,\s*"arguments"\s*:\s*(\{[^}]*\})\s*\}'
+)
+
+
 def _extract_tool_calls_with_regex(malformed_json: str) -> List[Dict[str, Any]]:
     """
     Extract tool calls using regex patterns as a last resort recovery method.
@@ -950,15 +1046,11 @@ def _extract_tool_calls_with_regex(malformed_json: str) -> List[Dict[str, Any]]:
     Returns:
         List of extracted tool call dictionaries
     """
-    import re
-    
     recovered_calls = []
     
     try:
-        # Pattern to extract individual tool call objects
-        tool_call_pattern = r'\{\s*"name"\s*:\s*"([^"]+)"\s*,\s*"arguments"\s*:\s*(\{[^}]*\}|\{[^}]*\})\s*\}'
-        
-        matches = re.findall(tool_call_pattern, malformed_json)
+        # OPTIMIZED: Pattern is compiled once at module load
+        matches = TOOL_CALL_OBJECT_PATTERN.findall(malformed_json)
         
         for match in matches:
             function_name = match[0]
@@ -1053,6 +1145,11 @@ def validate_tool_arguments(function_def: FunctionDefinition, arguments: Dict[st
     return validated_args
 
 
+# String spellings accepted for boolean parameters
+BOOLEAN_TRUE_STRINGS = frozenset({'true', '1', 'yes', 'on'})
+BOOLEAN_FALSE_STRINGS = frozenset({'false', '0', 'no', 'off'})
+
+
 def validate_parameter_value(value: Any, param_schema: ParameterSchema) -> Any:
     """
     Validate a single parameter value against its schema.
@@ -1094,9 +1191,10 @@ def validate_parameter_value(value: Any, param_schema: ParameterSchema) -> Any:
         if isinstance(value, bool):
             return value
         elif isinstance(value, str):
-            if value.lower() in ['true', '1', 'yes', 'on']:
+            normalized = value.lower()
+            if normalized in BOOLEAN_TRUE_STRINGS:
                 return True
-            elif value.lower() in ['false', '0', 'no', 'off']:
+            elif normalized in BOOLEAN_FALSE_STRINGS:
                 return False
         raise ValueError(f"Expected boolean, got {type(value).__name__}")
     
@@ -1165,8 +1263,16 @@ class ToolCallingSchemaError(Exception):
 
 
 class ToolCallingValidationError(Exception):
- """Exception raised for tool calling validation errors."""
- pass
+ """
+ Exception raised for tool calling validation errors.
+
+ Attributes:
+     code: Optional machine-readable error code (e.g. "all_tools_invalid")
+ """
+
+ def __init__(self, message: str, code: Optional[str] = None):
+     super().__init__(message)
+     self.code = code
 
 
 class ToolExecutionError(Exception):